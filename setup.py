@@ -0,0 +1,21 @@
+"""Build script adding optional mypyc compilation of the core modules.
+
+All metadata lives in pyproject.toml. Set TRIVIAL_TODO_APP_MYPYC=1 to compile
+storage.py and todo.py to C extensions; mypy must be installed in the build
+environment, e.g. ``TRIVIAL_TODO_APP_MYPYC=1 pip install --no-build-isolation .``
+"""
+
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get("TRIVIAL_TODO_APP_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(
+        ["src/trivial_todo_app/storage.py", "src/trivial_todo_app/todo.py"],
+        opt_level="3",
+    )
+
+setup(ext_modules=ext_modules)
@@ -5,17 +5,20 @@ from pathlib import Path
 
 import typer
 
-from trivial_todo_app.storage import TodoStorage
-from trivial_todo_app.todo import TodoManager
-
 app = typer.Typer(help="Trivial Todo App - Add, list, and mark todos as done")
 
 DEFAULT_TODO_FILE = Path("todos.json")
 
+# Status marker for a todo, indexed by its done flag
+STATUS = (" ", "✓")
+
 
 @app.command()
 def add(title: str) -> None:
     """Add a new todo item."""
+    from trivial_todo_app.storage import TodoStorage
+    from trivial_todo_app.todo import TodoManager
+
     try:
         storage = TodoStorage(DEFAULT_TODO_FILE)
         manager = TodoManager(storage)
@@ -32,17 +35,19 @@ def add(title: str) -> None:
 @app.command()
 def list() -> None:
     """List all todo items."""
+    from trivial_todo_app.storage import TodoStorage
+    from trivial_todo_app.todo import TodoManager
+
     try:
         storage = TodoStorage(DEFAULT_TODO_FILE)
         manager = TodoManager(storage)
-        todos = manager.list_all()
-
-        if not todos:
-            typer.echo("No todos found")
-        else:
-            for todo in todos:
-                status = "✓" if todo.done else " "
-                typer.echo(f"[{status}] #{todo.id}: {todo.title}")
+        # Render every line first so the whole listing goes out in one write;
+        # binding STATUS locally spares a global lookup per todo
+        status = STATUS
+        output = "\n".join(
+            f"[{status[todo.done]}] #{todo.id}: {todo.title}" for todo in manager.iter_all()
+        )
+        typer.echo(output or "No todos found")
     except Exception as e:
         typer.echo(f"Error: Failed to load todos: {e}", err=True)
         sys.exit(1)
@@ -51,31 +56,24 @@ def list() -> None:
 @app.command()
 def done(todo_id: int) -> None:
     """Mark a todo item as done."""
+    from trivial_todo_app.storage import TodoStorage
+    from trivial_todo_app.todo import TodoManager
+
     try:
         storage = TodoStorage(DEFAULT_TODO_FILE)
         manager = TodoManager(storage)
 
-        # Get all todos to find the one we need
-        todos = manager.list_all()
-        todo = None
-        for t in todos:
-            if t.id == todo_id:
-                todo = t
-                break
-
-        # Check if already done before calling mark_done
-        if todo and todo.done:
-            typer.echo(f"Todo #{todo_id} is already done")
-            return
-
-        manager.mark_done(todo_id)
-
-        # Get the updated todo to display its title
-        todos = manager.list_all()
-        for t in todos:
-            if t.id == todo_id:
-                typer.echo(f'Marked todo #{todo_id} as done: "{t.title}"')
+        try:
+            todo = manager.mark_done(todo_id)
+        except ValueError:
+            # Already done is informational; the lookup is served from the load cache
+            existing = storage.get(todo_id)
+            if existing is not None and existing.done:
+                typer.echo(f"Todo #{todo_id} is already done")
                 return
+            raise
+
+        typer.echo(f'Marked todo #{todo_id} as done: "{todo.title}"')
     except ValueError as e:
         typer.echo(f"Error: {e}", err=True)
         sys.exit(1)
@@ -0,0 +1,22 @@
+"""Entry point for `todo` that forwards commands to a running daemon if one is set."""
+
+import os
+import sys
+from pathlib import Path
+
+SOCKET_ENV = "TODO_DAEMON_SOCKET"
+
+
+def main() -> None:
+    """Forward to the daemon named by TODO_DAEMON_SOCKET, else run the CLI in-process."""
+    socket_path = os.environ.get(SOCKET_ENV)
+    if socket_path:
+        from trivial_todo_app.daemon import send
+
+        exit_code = send(sys.argv[1:], Path(socket_path))
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from trivial_todo_app.cli import main as cli_main
+
+    cli_main()
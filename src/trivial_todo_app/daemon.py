@@ -0,0 +1,156 @@
+"""Optional long-running daemon that keeps the CLI imported between commands.
+
+Start it with ``TODO_DAEMON_SOCKET=/path/to/todo.sock todo-daemon``. While the
+same variable is set, ``todo`` forwards its arguments over the Unix socket and
+prints the daemon's reply, skipping the Typer import and app construction;
+without it, or if nothing is listening, ``todo`` runs in-process.
+"""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+from typing import Any
+
+from trivial_todo_app.client import SOCKET_ENV
+
+# Seconds the daemon waits on one client's request before dropping it
+_CONNECTION_TIMEOUT = 2.0
+# Seconds a client waits for the reply; longer than the daemon may spend
+# dropping a stalled client queued ahead of it
+_REPLY_TIMEOUT = 10.0
+
+
+def send(args: list[str], socket_path: Path) -> int | None:
+    """Run a command on the daemon and echo its output.
+
+    Returns the command's exit code, or None if the request could not be
+    delivered, so the caller can run the command in-process instead. Once the
+    request is out the daemon may have run it, so a missing or broken reply is
+    reported as an error (exit code 1) rather than retried in-process.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(_REPLY_TIMEOUT)
+        try:
+            sock.connect(str(socket_path))
+            request = {"cwd": os.getcwd(), "args": args}
+            sock.sendall(json.dumps(request).encode())
+        except OSError:
+            # Nothing listening, no access to the socket, or the request didn't
+            # go out whole (the daemon can't parse a truncated one)
+            return None
+        try:
+            sock.shutdown(socket.SHUT_WR)
+            response = json.loads(_read_all(sock))
+            stdout, stderr = str(response["stdout"]), str(response["stderr"])
+            exit_code = int(response["exit_code"])
+        except TimeoutError:
+            sys.stderr.write(f"Error: todo-daemon did not reply within {_REPLY_TIMEOUT:g}s\n")
+            return 1
+        except (OSError, ValueError, KeyError, TypeError):
+            sys.stderr.write("Error: todo-daemon closed the connection without a valid reply\n")
+            return 1
+
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    return exit_code
+
+
+def serve(socket_path: Path) -> None:
+    """Listen on socket_path and run each received command in this process."""
+    # Import and build the Typer app once for the daemon's lifetime
+    import trivial_todo_app.cli  # noqa: F401
+
+    with contextlib.suppress(FileNotFoundError):
+        socket_path.unlink()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        # Create the socket owner read/write only (0600)
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(str(socket_path))
+        finally:
+            os.umask(old_umask)
+        server.listen()
+        try:
+            while True:
+                conn, _ = server.accept()
+                # Don't let one client that never finishes its request stall the rest
+                conn.settimeout(_CONNECTION_TIMEOUT)
+                # A malformed request or a client hanging up must not stop the daemon
+                with conn, contextlib.suppress(OSError, ValueError):
+                    handle(conn)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                socket_path.unlink()
+
+
+def handle(conn: socket.socket) -> None:
+    """Run the command read from conn and send back its output and exit code."""
+    request = json.loads(_read_all(conn))
+    if not (
+        isinstance(request, dict)
+        and isinstance(cwd := request.get("cwd"), str)
+        and isinstance(args := request.get("args"), list)
+        and all(isinstance(arg, str) for arg in args)
+    ):
+        raise ValueError("malformed request")
+    response = run(args, Path(cwd))
+    conn.sendall(json.dumps(response).encode())
+
+
+def run(args: list[str], cwd: Path) -> dict[str, Any]:
+    """Invoke the CLI with args from cwd, capturing its output and exit code."""
+    from trivial_todo_app.cli import app
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    previous_cwd = os.getcwd()
+    exit_code = 0
+    try:
+        os.chdir(cwd)
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            app(args=args, prog_name="todo")
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        # Keep the daemon alive if a command fails outside its own error handling
+        stderr.write(f"Error: {e}\n")
+        exit_code = 1
+    finally:
+        os.chdir(previous_cwd)
+    return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def main() -> None:
+    """Entry point for `todo-daemon`."""
+    socket_path = os.environ.get(SOCKET_ENV)
+    if not socket_path:
+        print(f"Error: set {SOCKET_ENV} to the socket path to listen on", file=sys.stderr)
+        sys.exit(1)
+    signal.signal(signal.SIGTERM, _terminate)
+    with contextlib.suppress(KeyboardInterrupt, _Terminated):
+        serve(Path(socket_path))
+
+
+class _Terminated(BaseException):
+    """Raised on SIGTERM to unwind serve(), which removes its socket on the way out.
+
+    Not a SystemExit, which run() catches as a command's exit, so it also stops
+    the daemon in the middle of a command.
+    """
+
+
+def _terminate(signum: int, frame: object) -> None:
+    """SIGTERM handler."""
+    raise _Terminated
+
+
+def _read_all(sock: socket.socket) -> bytes:
+    """Read from sock until the peer shuts down its side."""
+    chunks = []
+    while chunk := sock.recv(65536):
+        chunks.append(chunk)
+    return b"".join(chunks)
@@ -1,45 +1,240 @@
 """JSON file storage for todos."""
 
-import json
+import atexit
+import contextlib
+import os
 import tempfile
+from collections.abc import Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+import orjson
 
 from trivial_todo_app.todo import Todo
 
+if TYPE_CHECKING:
+    # concurrent.futures pulls in logging; only save_async() needs it at runtime
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+# Files this small ("", "[]") cannot hold a todo, so they are not parsed
+_MAX_EMPTY_SIZE = 2
+
+# Async saves no storage has flushed yet, checked for errors at exit. Futures
+# don't reference their storage, so this keeps no storage alive.
+_unflushed: "set[Future[None]]" = set()
+_exit_hook_registered = False
+
 
 class TodoStorage:
     """Simple JSON file storage for todos."""
 
-    def __init__(self, storage_path: Path = Path("todos.json")) -> None:
-        """Initialize storage with a file path."""
+    def __init__(self, storage_path: Path = Path("todos.json"), atomic: bool = True) -> None:
+        """Initialize storage with a file path.
+
+        With atomic=False, saves truncate and rewrite the file in place instead
+        of writing a temp file and renaming it over the original.
+        """
         self.storage_path = storage_path
+        self.atomic = atomic
+        # (st_ino, st_mtime_ns, st_size, todos) of the last file state we read
+        # or wrote; every atomic save renames a new inode into place
+        self._cache: tuple[int, int, int, list[Todo]] | None = None
+        # id -> todo index over the cached list it was built from
+        self._by_id: tuple[list[Todo], dict[int, Todo]] | None = None
+        # Background writer for save_async() and its not-yet-checked saves
+        self._writer: ThreadPoolExecutor | None = None
+        self._pending: list[Future[None]] = []
 
     def load(self) -> list[Todo]:
-        """Load todos from JSON file."""
-        if not self.storage_path.exists():
+        """Load todos from JSON file.
+
+        The parsed list is cached and reused while the file's inode, mtime and
+        size are unchanged, so repeated loads within one command parse only once.
+        Callers get copies of the cached todos and may modify them freely.
+        Queued async saves are waited for first, so loads see them.
+        """
+        return _copy(self._todos())
+
+    def get(self, todo_id: int) -> Todo | None:
+        """Return a copy of the todo with the given id, or None if there is none."""
+        todos = self._todos()
+        if self._by_id is None or self._by_id[0] is not todos:
+            self._by_id = (todos, {todo.id: todo for todo in todos})
+        todo = self._by_id[1].get(todo_id)
+        return None if todo is None else Todo(todo.id, todo.title, todo.done)
+
+    def iter_todos(self) -> Iterator[Todo]:
+        """Yield todos one at a time without building an intermediate list."""
+        self._wait_for_writer()
+        st = self._stat()
+        if st is None or st.st_size <= _MAX_EMPTY_SIZE:
+            return
+        cached = self._cached(st)
+        if cached is not None:
+            for todo in cached:
+                yield Todo(todo.id, todo.title, todo.done)
+        else:
+            yield from self._parse()
+
+    def _todos(self) -> list[Todo]:
+        """Return the cached todo list, re-reading the file if it has changed."""
+        self._wait_for_writer()
+        st = self._stat()
+        if st is None or st.st_size <= _MAX_EMPTY_SIZE:
             return []
+        cached = self._cached(st)
+        if cached is not None:
+            return cached
+        todos = list(self._parse())
+        self._cache = (st.st_ino, st.st_mtime_ns, st.st_size, todos)
+        return todos
+
+    def _stat(self) -> os.stat_result | None:
+        """Stat the todos file, or return None if it doesn't exist."""
         try:
-            data = json.loads(self.storage_path.read_text())
-            return [Todo(id=item["id"], title=item["title"], done=item["done"]) for item in data]
-        except json.JSONDecodeError:
-            return []
+            return os.stat(self.storage_path)
+        except FileNotFoundError:
+            return None
+
+    def _cached(self, st: os.stat_result) -> list[Todo] | None:
+        """Return the cached todos if the file is unchanged since they were read."""
+        if self._cache is not None and self._cache[:3] == (st.st_ino, st.st_mtime_ns, st.st_size):
+            return self._cache[3]
+        return None
+
+    def _parse(self) -> Iterator[Todo]:
+        """Parse the JSON file and yield a Todo per record."""
+        try:
+            data = orjson.loads(self.storage_path.read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return
+        for item in data:
+            yield Todo.from_json(item)
 
     def save(self, todos: list[Todo]) -> None:
-        """Save todos to JSON file using atomic write."""
-        data = [{"id": t.id, "title": t.title, "done": t.done} for t in todos]
-        json_data = json.dumps(data)
+        """Save todos to JSON file, atomically unless disabled.
+
+        Queued async saves are flushed first, re-raising a failure as flush()
+        does, so none of them can land after this one.
+        """
+        self.flush()
+        self._write(_dumps(todos), _copy(todos))
+
+    def save_async(self, todos: list[Todo]) -> "Future[None]":
+        """Save a snapshot of todos on a background writer thread.
+
+        The todos are serialized and copied before this returns, so later
+        changes to them are not saved. Saves run one at a time in submission
+        order and complete before the interpreter exits. Call flush() (or use
+        the returned future) to wait for them and surface write errors.
+        """
+        if self._writer is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="todo-writer")
+            _register_exit_hook()
+        future = self._writer.submit(self._write, _dumps(todos), _copy(todos))
+        self._pending.append(future)
+        _unflushed.add(future)
+        return future
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Wait for queued async saves, re-raising the first one that failed.
+
+        Once every save has been waited for, the writer thread is shut down;
+        the next save_async() starts a new one.
+        """
+        while self._pending:
+            error = self._pending[0].exception(timeout)
+            _unflushed.discard(self._pending.pop(0))
+            if error is not None:
+                raise error
+        if self._writer is not None:
+            self._writer.shutdown()
+            self._writer = None
 
-        # Atomic write: write to temp file in same directory, then rename
+    def _wait_for_writer(self) -> None:
+        """Wait for queued async saves to finish, leaving their errors to flush()."""
+        for future in self._pending:
+            future.exception()
+
+    def _write(self, json_bytes: bytes, todos: list[Todo]) -> None:
+        """Write serialized todos to disk and cache todos, a private copy of them."""
+        try:
+            if self.atomic:
+                self._replace(json_bytes)
+            else:
+                self._overwrite(json_bytes)
+        except BaseException:
+            self._cache = None
+            raise
+
+        st = os.stat(self.storage_path)
+        self._cache = (st.st_ino, st.st_mtime_ns, st.st_size, todos)
+
+    def _replace(self, json_bytes: bytes) -> None:
+        """Write to a temp file in the same directory, fsync it, then rename it over."""
         fd, temp_path = tempfile.mkstemp(
             dir=self.storage_path.parent, prefix=".tmp_todos_", suffix=".json"
         )
         try:
-            Path(temp_path).write_text(json_data)
-            Path(temp_path).replace(self.storage_path)
-        finally:
             try:
-                import os
-
+                _write_all(fd, json_bytes)
+                os.fsync(fd)
+            finally:
                 os.close(fd)
-            except OSError:
-                pass
+            os.replace(temp_path, self.storage_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+
+    def _overwrite(self, json_bytes: bytes) -> None:
+        """Truncate and rewrite the storage file in place."""
+        fd = os.open(self.storage_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _write_all(fd, json_bytes)
+        finally:
+            os.close(fd)
+
+
+def _dumps(todos: list[Todo]) -> bytes:
+    """Serialize todos to the compact JSON array stored on disk."""
+    # orjson's native encoder beats a hand-rolled per-record f-string template
+    # for this schema.
+    # Passing the todos straight to orjson gives identical bytes but is ~3x
+    # slower: it serializes slots dataclasses through a generic per-field path,
+    # while building the dicts here keeps orjson on its fastest container type.
+    return orjson.dumps([t.to_json() for t in todos])
+
+
+def _register_exit_hook() -> None:
+    """Have _flush_all run at interpreter exit; done once, on the first async save."""
+    global _exit_hook_registered
+    if not _exit_hook_registered:
+        atexit.register(_flush_all)
+        _exit_hook_registered = True
+
+
+def _flush_all() -> None:
+    """Report async save errors nobody flushed before exit.
+
+    Writer threads are joined before atexit handlers run, so every queued
+    save has already completed by now.
+    """
+    while _unflushed:
+        error = _unflushed.pop().exception()
+        if error is not None:
+            raise error
+
+
+def _copy(todos: list[Todo]) -> list[Todo]:
+    """Copy each todo, so the cache and its callers never share instances."""
+    return [Todo(todo.id, todo.title, todo.done) for todo in todos]
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of data to fd, retrying on short writes."""
+    written = os.write(fd, data)
+    while written < len(data):
+        written += os.write(fd, data[written:])
@@ -1,13 +1,14 @@
 """Todo data model."""
 
+from collections.abc import Iterator
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from trivial_todo_app.storage import TodoStorage
 
 
-@dataclass
+@dataclass(slots=True)
 class Todo:
     """A todo item with title and done status."""
 
@@ -15,6 +16,15 @@ class Todo:
     title: str
     done: bool = False
 
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "Todo":
+        """Build a todo from its decoded JSON record."""
+        return cls(id=data["id"], title=data["title"], done=data["done"])
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the JSON record for this todo."""
+        return {"id": self.id, "title": self.title, "done": self.done}
+
 
 class TodoManager:
     """Manages todo business logic and coordinates with storage."""
@@ -47,8 +57,12 @@ class TodoManager:
         """Return all todos from storage."""
         return self.storage.load()
 
-    def mark_done(self, todo_id: int) -> None:
-        """Mark a todo as done."""
+    def iter_all(self) -> Iterator[Todo]:
+        """Yield todos from storage one at a time."""
+        return self.storage.iter_todos()
+
+    def mark_done(self, todo_id: int) -> Todo:
+        """Mark a todo as done and return it."""
         todos = self.storage.load()
 
         # Find the todo
@@ -66,6 +80,8 @@ class TodoManager:
         if todo.done:
             raise ValueError(f"Todo #{todo_id} is already done")
 
-        # Mark as done and save
+        # Mark as done and save the same list it was found in
         todo.done = True
         self.storage.save(todos)
+
+        return todo
@@ -10,6 +10,8 @@ Per docs/testing-strategy.md section "Layer 4 - Black Box Tests"
 
 import json
 import subprocess
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
@@ -35,22 +37,62 @@ def isolated_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
     return tmp_path
 
 
-def run_todo(args: list[str], check: bool = False) -> subprocess.CompletedProcess[str]:
+@dataclass
+class TodoResult:
+    """Exit code and raw output of a 'todo' run, decoded only when read."""
+
+    returncode: int
+    stdout_bytes: bytes
+    stderr_bytes: bytes
+
+    @cached_property
+    def stdout(self) -> str:
+        """Captured stdout as text."""
+        return self.stdout_bytes.decode()
+
+    @cached_property
+    def stderr(self) -> str:
+        """Captured stderr as text."""
+        return self.stderr_bytes.decode()
+
+
+def run_todo(args: list[str], check: bool = False) -> TodoResult:
     """Run the 'todo' command via subprocess.
 
+    Output is captured as bytes and only decoded if a test reads it.
+
     Args:
         args: Command arguments (e.g., ["add", "Buy groceries"])
         check: If True, raise exception on non-zero exit code
 
     Returns:
-        CompletedProcess with stdout, stderr, and returncode
+        TodoResult with stdout, stderr, and returncode
     """
-    return subprocess.run(
+    result = subprocess.run(
         ["todo"] + args,
         capture_output=True,
-        text=True,
         check=check,
     )
+    return TodoResult(result.returncode, result.stdout, result.stderr)
+
+
+def run_todo_returncode(args: list[str]) -> int:
+    """Run the 'todo' command via subprocess and return only its exit code.
+
+    Output is sent to /dev/null rather than captured, for calls whose stdout
+    and stderr are never inspected.
+
+    Args:
+        args: Command arguments (e.g., ["add", "Buy groceries"])
+
+    Returns:
+        The command's exit code
+    """
+    return subprocess.run(
+        ["todo"] + args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    ).returncode
 
 
 def read_todos_json(temp_dir: Path) -> list[dict[str, Any]]:
@@ -104,9 +146,9 @@ class TestWorkflow2AddAndList:
     def test_list_shows_all_todos_in_table_format(self, isolated_env: Path) -> None:
         """List shows all added todos in the correct table format."""
         # Add multiple todos
-        run_todo(["add", "Buy groceries"])
-        run_todo(["add", "Walk the dog"])
-        run_todo(["add", "Read a book"])
+        assert run_todo_returncode(["add", "Buy groceries"]) == 0
+        assert run_todo_returncode(["add", "Walk the dog"]) == 0
+        assert run_todo_returncode(["add", "Read a book"]) == 0
 
         # List todos
         result = run_todo(["list"])
@@ -123,7 +165,7 @@ class TestWorkflow3MarkDone:
     def test_mark_done_shows_checkmark_in_list(self, isolated_env: Path) -> None:
         """Add todo, mark as done, list shows '✓ Done'."""
         # Add a todo
-        run_todo(["add", "Buy groceries"])
+        assert run_todo_returncode(["add", "Buy groceries"]) == 0
 
         # Mark as done
         result = run_todo(["done", "1"])
@@ -142,8 +184,7 @@ class TestWorkflow4PersistenceAcrossInvocations:
     def test_data_persists_across_subprocesses(self, isolated_env: Path) -> None:
         """Add todo in one subprocess, list in another, data persists."""
         # Add in first subprocess
-        result1 = run_todo(["add", "Persistent todo"])
-        assert result1.returncode == 0
+        assert run_todo_returncode(["add", "Persistent todo"]) == 0
 
         # List in second subprocess (separate invocation)
         result2 = run_todo(["list"])
@@ -153,11 +194,11 @@ class TestWorkflow4PersistenceAcrossInvocations:
     def test_file_contents_match_expected_json_format(self, isolated_env: Path) -> None:
         """File contents match expected JSON format after operations."""
         # Add todos
-        run_todo(["add", "First todo"])
-        run_todo(["add", "Second todo"])
+        assert run_todo_returncode(["add", "First todo"]) == 0
+        assert run_todo_returncode(["add", "Second todo"]) == 0
 
         # Mark one done
-        run_todo(["done", "1"])
+        assert run_todo_returncode(["done", "1"]) == 0
 
         # Read and verify JSON file structure
         todos = read_todos_json(isolated_env)
@@ -189,10 +230,10 @@ class TestWorkflow5ErrorInvalidId:
     def test_invalid_id_causes_no_data_corruption(self, isolated_env: Path) -> None:
         """Invalid ID operation causes no data corruption."""
         # Add a todo
-        run_todo(["add", "Valid todo"])
+        assert run_todo_returncode(["add", "Valid todo"]) == 0
 
         # Try invalid operation
-        run_todo(["done", "999"])
+        assert run_todo_returncode(["done", "999"]) == 1
 
         # Verify data integrity
         todos = read_todos_json(isolated_env)
@@ -213,11 +254,10 @@ class TestWorkflow6ErrorAlreadyDone:
         message on stdout, which matches the spec's "Already Done Output" section.
         """
         # Add a todo
-        run_todo(["add", "Todo to complete"])
+        assert run_todo_returncode(["add", "Todo to complete"]) == 0
 
         # Mark as done first time
-        result1 = run_todo(["done", "1"])
-        assert result1.returncode == 0
+        assert run_todo_returncode(["done", "1"]) == 0
 
         # Mark as done second time
         result2 = run_todo(["done", "1"])
@@ -244,7 +284,7 @@ class TestWorkflow7ErrorInvalidInput:
         says all errors should use exit code 1, but Typer's behavior differs.
         """
         # Add a todo first
-        run_todo(["add", "Valid todo"])
+        assert run_todo_returncode(["add", "Valid todo"]) == 0
 
         # Try with non-integer ID
         result = run_todo(["done", "abc"])
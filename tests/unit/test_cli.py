@@ -1,234 +1,200 @@
 """Unit tests for CLI error handling paths."""
 
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
 
 from trivial_todo_app.cli import add, done, list, main
 from trivial_todo_app.todo import Todo
 
 
+class FakeManager:
+    """Stand-in for TodoManager that returns, or raises, preset outcomes.
+
+    Pass an exception instance as an outcome to have that method raise it.
+    Calls are recorded in order as (method name, argument) pairs.
+    """
+
+    def __init__(self, *, add=None, iter_all=(), mark_done=None):
+        self._add = add
+        self._iter_all = iter_all
+        self._mark_done = mark_done
+        self.calls = []
+
+    def add(self, title):
+        self.calls.append(("add", title))
+        return _outcome(self._add)
+
+    def iter_all(self):
+        self.calls.append(("iter_all", None))
+        return iter(_outcome(self._iter_all))
+
+    def mark_done(self, todo_id):
+        self.calls.append(("mark_done", todo_id))
+        return _outcome(self._mark_done)
+
+
+def _outcome(value):
+    """Raise value if it is an exception, otherwise return it."""
+    if isinstance(value, Exception):
+        raise value
+    return value
+
+
+@pytest.fixture(autouse=True)
+def cli_mocks(monkeypatch):
+    """Replace echo, exit, the manager and the storage for every CLI test.
+
+    Commands import TodoManager and TodoStorage when they run, so the classes
+    are patched on their source modules. TodoManager returns whatever FakeManager
+    a test assigns to cli_mocks.manager; TodoStorage returns a shared mock.
+    """
+    mocks = SimpleNamespace(echo=Mock(), exit=Mock(), manager=FakeManager(), storage=Mock())
+    # By default the todo being marked done doesn't exist
+    mocks.storage.get.return_value = None
+    monkeypatch.setattr("trivial_todo_app.cli.typer.echo", mocks.echo)
+    monkeypatch.setattr("trivial_todo_app.cli.sys.exit", mocks.exit)
+    monkeypatch.setattr("trivial_todo_app.todo.TodoManager", lambda storage: mocks.manager)
+    monkeypatch.setattr("trivial_todo_app.storage.TodoStorage", Mock(return_value=mocks.storage))
+    return mocks
+
+
 class TestAddCommandErrorHandling:
     """Tests for add command error handling paths."""
 
-    @patch("trivial_todo_app.cli.typer.echo")
-    @patch("trivial_todo_app.cli.TodoManager")
-    @patch("trivial_todo_app.cli.TodoStorage")
-    def test_add_successfully_adds_todo(self, mock_storage_class, mock_manager_class, mock_echo):
+    def test_add_successfully_adds_todo(self, cli_mocks):
         """Add command successfully adds a todo and displays success message."""
         # Setup: manager.add returns a new todo
-        mock_manager = Mock()
-        new_todo = Todo(id=1, title="Test todo", done=False)
-        mock_manager.add.return_value = new_todo
-        mock_manager_class.return_value = mock_manager
+        cli_mocks.manager = FakeManager(add=Todo(id=1, title="Test todo", done=False))
 
         # Execute
         add("Test todo")
 
         # Verify success message was echoed
-        mock_echo.assert_called_once_with('Added todo #1: "Test todo"')
-
-    @patch("trivial_todo_app.cli.sys.exit")
-    @patch("trivial_todo_app.cli.typer.echo")
-    @patch("trivial_todo_app.cli.TodoManager")
-    @patch("trivial_todo_app.cli.TodoStorage")
-    def test_add_handles_value_error_from_manager(
-        self, mock_storage_class, mock_manager_class, mock_echo, mock_exit
-    ):
-        """Add command handles ValueError from manager and exits with code 1."""
-        # Setup: manager.add raises ValueError
-        mock_manager = Mock()
-        mock_manager.add.side_effect = ValueError("Title cannot be empty")
-        mock_manager_class.return_value = mock_manager
-
-        # Execute
-        add("")
-
-        # Verify error was echoed to stderr and exit(1) was called
-        mock_echo.assert_called_once_with("Error: Title cannot be empty", err=True)
-        mock_exit.assert_called_once_with(1)
-
-    @patch("trivial_todo_app.cli.sys.exit")
-    @patch("trivial_todo_app.cli.typer.echo")
-    @patch("trivial_todo_app.cli.TodoManager")
-    @patch("trivial_todo_app.cli.TodoStorage")
-    def test_add_handles_generic_exception_from_storage(
-        self, mock_storage_class, mock_manager_class, mock_echo, mock_exit
-    ):
-        """Add command handles generic Exception from storage and exits with code 1."""
-        # Setup: manager.add raises generic exception (e.g., I/O error)
-        mock_manager = Mock()
-        mock_manager.add.side_effect = OSError("Permission denied")
-        mock_manager_class.return_value = mock_manager
+        cli_mocks.echo.assert_called_once_with('Added todo #1: "Test todo"')
+
+    @pytest.mark.parametrize(
+        ("exc", "msg"),
+        [
+            (ValueError("Title cannot be empty"), "Error: Title cannot be empty"),
+            (OSError("Permission denied"), "Error: Failed to save todo: Permission denied"),
+        ],
+    )
+    def test_add_reports_errors_and_exits_1(self, cli_mocks, exc, msg):
+        """Add command reports validation and storage errors and exits with code 1."""
+        # Setup: manager.add raises
+        cli_mocks.manager = FakeManager(add=exc)
 
         # Execute
         add("Test todo")
 
         # Verify error was echoed to stderr and exit(1) was called
-        mock_echo.assert_called_once_with("Error: Failed to save todo: Permission denied", err=True)
-        mock_exit.assert_called_once_with(1)
+        cli_mocks.echo.assert_called_once_with(msg, err=True)
+        cli_mocks.exit.assert_called_once_with(1)
 
 
 class TestListCommandErrorHandling:
     """Tests for list command error handling paths."""
 
-    @patch("trivial_todo_app.cli.typer.echo")
-    @patch("trivial_todo_app.cli.TodoManager")
-    @patch("trivial_todo_app.cli.TodoStorage")
-    def test_list_displays_no_todos_message_when_empty(
-        self, mock_storage_class, mock_manager_class, mock_echo
-    ):
+    def test_list_displays_no_todos_message_when_empty(self, cli_mocks):
         """List command displays 'No todos found' when list is empty."""
-        # Setup: manager.list_all returns empty list
-        mock_manager = Mock()
-        mock_manager.list_all.return_value = []
-        mock_manager_class.return_value = mock_manager
+        # Setup: manager.iter_all yields nothing (the FakeManager default)
 
         # Execute
         list()
 
         # Verify message was echoed
-        mock_echo.assert_called_once_with("No todos found")
-
-    @patch("trivial_todo_app.cli.typer.echo")
-    @patch("trivial_todo_app.cli.TodoManager")
-    @patch("trivial_todo_app.cli.TodoStorage")
-    def test_list_displays_todos_when_present(
-        self, mock_storage_class, mock_manager_class, mock_echo
-    ):
+        cli_mocks.echo.assert_called_once_with("No todos found")
+
+    def test_list_displays_todos_when_present(self, cli_mocks):
         """List command displays all todos with proper formatting."""
-        # Setup: manager.list_all returns todos
-        mock_manager = Mock()
-        todos = [
-            Todo(id=1, title="First todo", done=False),
-            Todo(id=2, title="Second todo", done=True),
-        ]
-        mock_manager.list_all.return_value = todos
-        mock_manager_class.return_value = mock_manager
+        # Setup: manager.iter_all yields todos
+        cli_mocks.manager = FakeManager(
+            iter_all=[
+                Todo(id=1, title="First todo", done=False),
+                Todo(id=2, title="Second todo", done=True),
+            ]
+        )
 
         # Execute
         list()
 
-        # Verify todos were displayed
-        assert mock_echo.call_count == 2
-        mock_echo.assert_any_call("[ ] #1: First todo")
-        mock_echo.assert_any_call("[✓] #2: Second todo")
-
-    @patch("trivial_todo_app.cli.sys.exit")
-    @patch("trivial_todo_app.cli.typer.echo")
-    @patch("trivial_todo_app.cli.TodoManager")
-    @patch("trivial_todo_app.cli.TodoStorage")
-    def test_list_handles_exception_from_storage(
-        self, mock_storage_class, mock_manager_class, mock_echo, mock_exit
-    ):
+        # Verify todos were displayed in a single echo
+        cli_mocks.echo.assert_called_once_with("[ ] #1: First todo\n[✓] #2: Second todo")
+
+    def test_list_handles_exception_from_storage(self, cli_mocks):
         """List command handles Exception from storage and exits with code 1."""
-        # Setup: manager.list_all raises exception (e.g., I/O error)
-        mock_manager = Mock()
-        mock_manager.list_all.side_effect = OSError("Failed to read file")
-        mock_manager_class.return_value = mock_manager
+        # Setup: manager.iter_all raises exception (e.g., I/O error)
+        cli_mocks.manager = FakeManager(iter_all=OSError("Failed to read file"))
 
         # Execute
         list()
 
         # Verify error was echoed to stderr and exit(1) was called
-        mock_echo.assert_called_once_with(
+        cli_mocks.echo.assert_called_once_with(
             "Error: Failed to load todos: Failed to read file", err=True
         )
-        mock_exit.assert_called_once_with(1)
+        cli_mocks.exit.assert_called_once_with(1)
 
 
 class TestDoneCommandErrorHandling:
     """Tests for done command error handling paths."""
 
-    @patch("trivial_todo_app.cli.typer.echo")
-    @patch("trivial_todo_app.cli.TodoManager")
-    @patch("trivial_todo_app.cli.TodoStorage")
-    def test_done_successfully_marks_todo_as_done(
-        self, mock_storage_class, mock_manager_class, mock_echo
-    ):
+    def test_done_successfully_marks_todo_as_done(self, cli_mocks):
         """Done command successfully marks a todo as done and displays success message."""
-        # Setup: manager returns todo before and after marking done
-        mock_manager = Mock()
-        not_done_todo = Todo(id=1, title="Test todo", done=False)
-        done_todo = Todo(id=1, title="Test todo", done=True)
-        # First call returns [not_done_todo], second call returns [done_todo]
-        mock_manager.list_all.side_effect = [[not_done_todo], [done_todo]]
-        mock_manager_class.return_value = mock_manager
+        # Setup: manager.mark_done returns the updated todo
+        cli_mocks.manager = FakeManager(mark_done=Todo(id=1, title="Test todo", done=True))
 
         # Execute
         done(1)
 
-        # Verify mark_done was called and success message was echoed
-        mock_manager.mark_done.assert_called_once_with(1)
-        mock_echo.assert_called_once_with('Marked todo #1 as done: "Test todo"')
-
-    @patch("trivial_todo_app.cli.typer.echo")
-    @patch("trivial_todo_app.cli.TodoManager")
-    @patch("trivial_todo_app.cli.TodoStorage")
-    def test_done_handles_already_done_todo(
-        self, mock_storage_class, mock_manager_class, mock_echo
-    ):
-        """Done command detects already-done todo and returns early."""
-        # Setup: manager returns a todo that's already done
-        mock_manager = Mock()
-        already_done_todo = Todo(id=1, title="Test", done=True)
-        mock_manager.list_all.return_value = [already_done_todo]
-        mock_manager_class.return_value = mock_manager
+        # Verify mark_done was called, nothing was reloaded and message was echoed
+        assert cli_mocks.manager.calls == [("mark_done", 1)]
+        cli_mocks.storage.get.assert_not_called()
+        cli_mocks.echo.assert_called_once_with('Marked todo #1 as done: "Test todo"')
+
+    def test_done_handles_already_done_todo(self, cli_mocks):
+        """Done command reports an already-done todo without an error."""
+        # Setup: manager.mark_done rejects a todo that's already done
+        cli_mocks.manager = FakeManager(mark_done=ValueError("Todo #1 is already done"))
+        cli_mocks.storage.get.return_value = Todo(id=1, title="Test", done=True)
 
         # Execute
         done(1)
 
-        # Verify message was displayed and mark_done was NOT called
-        mock_echo.assert_called_once_with("Todo #1 is already done")
-        mock_manager.mark_done.assert_not_called()
-
-    @patch("trivial_todo_app.cli.sys.exit")
-    @patch("trivial_todo_app.cli.typer.echo")
-    @patch("trivial_todo_app.cli.TodoManager")
-    @patch("trivial_todo_app.cli.TodoStorage")
-    def test_done_handles_value_error_from_manager(
-        self, mock_storage_class, mock_manager_class, mock_echo, mock_exit
-    ):
-        """Done command handles ValueError from manager and exits with code 1."""
-        # Setup: manager.mark_done raises ValueError (todo not found)
-        mock_manager = Mock()
-        mock_manager.list_all.return_value = []
-        mock_manager.mark_done.side_effect = ValueError("Todo #999 not found")
-        mock_manager_class.return_value = mock_manager
+        # Verify informational message was displayed on stdout
+        cli_mocks.echo.assert_called_once_with("Todo #1 is already done")
+        cli_mocks.exit.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("exc", "msg"),
+        [
+            (ValueError("Todo #999 not found"), "Error: Todo #999 not found"),
+            (OSError("Disk full"), "Error: Failed to save todo: Disk full"),
+        ],
+    )
+    def test_done_reports_errors_and_exits_1(self, cli_mocks, exc, msg):
+        """Done command reports a missing todo or storage error and exits with code 1."""
+        # Setup: manager.mark_done raises
+        cli_mocks.manager = FakeManager(mark_done=exc)
 
         # Execute
         done(999)
 
         # Verify error was echoed to stderr and exit(1) was called
-        mock_echo.assert_called_once_with("Error: Todo #999 not found", err=True)
-        mock_exit.assert_called_once_with(1)
-
-    @patch("trivial_todo_app.cli.sys.exit")
-    @patch("trivial_todo_app.cli.typer.echo")
-    @patch("trivial_todo_app.cli.TodoManager")
-    @patch("trivial_todo_app.cli.TodoStorage")
-    def test_done_handles_generic_exception_from_storage(
-        self, mock_storage_class, mock_manager_class, mock_echo, mock_exit
-    ):
-        """Done command handles generic Exception from storage and exits with code 1."""
-        # Setup: manager.mark_done raises generic exception (e.g., I/O error)
-        mock_manager = Mock()
-        mock_manager.list_all.return_value = [Todo(id=1, title="Test", done=False)]
-        mock_manager.mark_done.side_effect = OSError("Disk full")
-        mock_manager_class.return_value = mock_manager
-
-        # Execute
-        done(1)
-
-        # Verify error was echoed to stderr and exit(1) was called
-        mock_echo.assert_called_once_with("Error: Failed to save todo: Disk full", err=True)
-        mock_exit.assert_called_once_with(1)
+        cli_mocks.echo.assert_called_once_with(msg, err=True)
+        cli_mocks.exit.assert_called_once_with(1)
 
 
 class TestMainEntryPoint:
     """Tests for main() entry point."""
 
-    @patch("trivial_todo_app.cli.app")
-    def test_main_calls_app(self, mock_app):
+    def test_main_calls_app(self, monkeypatch):
         """Main function invokes the typer app."""
+        mock_app = Mock()
+        monkeypatch.setattr("trivial_todo_app.cli.app", mock_app)
+
         # Execute
         main()
 
@@ -0,0 +1,220 @@
+"""Unit tests for the command daemon and the forwarding `todo` entry point."""
+
+import os
+import signal
+import socket
+import stat
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from trivial_todo_app import client
+from trivial_todo_app import daemon as daemon_module
+from trivial_todo_app.daemon import handle, run, send
+
+
+class TestRun:
+    """Tests for running CLI commands inside the daemon process."""
+
+    def test_run_captures_output_and_exit_code(self, tmp_path: Path) -> None:
+        """Run executes the command in cwd and returns its output and exit code."""
+        result = run(["add", "Buy groceries"], tmp_path)
+
+        assert result == {
+            "exit_code": 0,
+            "stdout": 'Added todo #1: "Buy groceries"\n',
+            "stderr": "",
+        }
+        assert (tmp_path / "todos.json").exists()
+
+    def test_run_reports_command_errors(self, tmp_path: Path) -> None:
+        """Run returns the CLI's error message and exit code 1 on failure."""
+        result = run(["done", "999"], tmp_path)
+
+        assert result["exit_code"] == 1
+        assert result["stderr"] == "Error: Todo #999 not found\n"
+
+    def test_run_lets_sigterm_through_mid_command(self, tmp_path: Path) -> None:
+        """A SIGTERM arriving during a command stops the daemon instead of ending the command."""
+
+        def terminated_mid_command(**kwargs: object) -> None:
+            daemon_module._terminate(signal.SIGTERM, None)
+
+        with (
+            patch("trivial_todo_app.cli.app", side_effect=terminated_mid_command),
+            pytest.raises(daemon_module._Terminated),
+        ):
+            run(["list"], tmp_path)
+
+
+class TestHandle:
+    """Tests for reading one request off a client connection."""
+
+    @pytest.mark.parametrize(
+        "request_bytes",
+        [b"[]", b'"x"', b'{"args": ["list"], "cwd": 5}', b'{"args": "list", "cwd": "/"}', b"{"],
+    )
+    def test_handle_rejects_malformed_request(self, request_bytes: bytes) -> None:
+        """Requests that aren't {"args": [str, ...], "cwd": str} raise ValueError, run nothing."""
+        client_end, daemon_end = socket.socketpair()
+        with client_end, daemon_end:
+            client_end.sendall(request_bytes)
+            client_end.shutdown(socket.SHUT_WR)
+
+            with patch("trivial_todo_app.daemon.run") as mock_run, pytest.raises(ValueError):
+                handle(daemon_end)
+
+        mock_run.assert_not_called()
+
+
+class TestSend:
+    """Tests for forwarding a command to the daemon over its socket."""
+
+    def test_send_round_trips_command_through_daemon(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Send prints the daemon's output and returns its exit code."""
+        socket_path = tmp_path / "todo.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(socket_path))
+            server.listen()
+
+            def serve_one() -> None:
+                conn, _ = server.accept()
+                with conn:
+                    handle(conn)
+
+            thread = threading.Thread(target=serve_one)
+            thread.start()
+            with patch("trivial_todo_app.daemon.os.getcwd", return_value=str(tmp_path)):
+                exit_code = send(["list"], socket_path)
+            thread.join()
+
+        assert exit_code == 0
+        assert capsys.readouterr().out == "No todos found\n"
+
+    def test_send_returns_none_without_daemon(self, tmp_path: Path) -> None:
+        """Send returns None when nothing is listening on the socket path."""
+        assert send(["list"], tmp_path / "missing.sock") is None
+
+    def test_send_reports_error_when_daemon_drops_connection(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Once the request is sent, a missing reply is an error, not an in-process rerun."""
+        socket_path = tmp_path / "todo.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(socket_path))
+            server.listen()
+
+            def drop_one() -> None:
+                conn, _ = server.accept()
+                conn.close()
+
+            thread = threading.Thread(target=drop_one)
+            thread.start()
+            exit_code = send(["add", "Once"], socket_path)
+            thread.join()
+
+        assert exit_code == 1
+        assert capsys.readouterr().err == (
+            "Error: todo-daemon closed the connection without a valid reply\n"
+        )
+
+    def test_send_times_out_waiting_for_reply(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Send gives up on a daemon that accepts the request but never replies."""
+        socket_path = tmp_path / "todo.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(socket_path))
+            server.listen()
+
+            with patch("trivial_todo_app.daemon._REPLY_TIMEOUT", 0.05):
+                exit_code = send(["list"], socket_path)
+
+        assert exit_code == 1
+        assert capsys.readouterr().err == "Error: todo-daemon did not reply within 0.05s\n"
+
+    def test_send_returns_none_when_socket_is_not_accessible(self, tmp_path: Path) -> None:
+        """Send returns None for connect errors other than a missing or refused socket."""
+        with patch("trivial_todo_app.daemon.socket.socket.connect", side_effect=PermissionError):
+            assert send(["list"], tmp_path / "todo.sock") is None
+
+
+@pytest.fixture
+def daemon_process(tmp_path: Path) -> Iterator[tuple[subprocess.Popen[bytes], Path]]:
+    """Start a real `todo-daemon` on a socket under tmp_path and wait until it listens."""
+    socket_path = tmp_path / "todo.sock"
+    process = subprocess.Popen(
+        [sys.executable, "-c", "from trivial_todo_app.daemon import main; main()"],
+        env={**os.environ, client.SOCKET_ENV: str(socket_path)},
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while not socket_path.exists():
+            assert process.poll() is None, "daemon exited before creating its socket"
+            assert time.monotonic() < deadline, "daemon did not create its socket"
+            time.sleep(0.01)
+        yield process, socket_path
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+class TestServe:
+    """Tests for the daemon's socket lifecycle, run as a real `todo-daemon` process."""
+
+    def test_daemon_creates_private_socket_and_removes_it_on_sigterm(
+        self, daemon_process: tuple[subprocess.Popen[bytes], Path]
+    ) -> None:
+        """The socket is created mode 0600 and unlinked when the daemon is terminated."""
+        process, socket_path = daemon_process
+
+        assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=10) == 0
+        assert not socket_path.exists()
+
+    def test_daemon_survives_malformed_request(
+        self,
+        daemon_process: tuple[subprocess.Popen[bytes], Path],
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """A request that is valid JSON but not an object is dropped; the next one is served."""
+        process, socket_path = daemon_process
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+            sock.sendall(b"[]")
+            sock.shutdown(socket.SHUT_WR)
+            assert sock.recv(1) == b""
+
+        with patch("trivial_todo_app.daemon.os.getcwd", return_value=str(tmp_path)):
+            exit_code = send(["list"], socket_path)
+
+        assert process.poll() is None
+        assert exit_code == 0
+        assert capsys.readouterr().out == "No todos found\n"
+
+
+class TestClientMain:
+    """Tests for the `todo` entry point."""
+
+    def test_client_falls_back_to_in_process_cli(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Without a listening daemon, the CLI runs in-process."""
+        monkeypatch.setenv(client.SOCKET_ENV, str(tmp_path / "missing.sock"))
+
+        with patch("trivial_todo_app.cli.main") as mock_cli_main:
+            client.main()
+
+        mock_cli_main.assert_called_once_with()
@@ -1,33 +1,60 @@
 """Unit tests for TodoStorage."""
 
-import json
+import os
+import subprocess
+import sys
 import tempfile
+import threading
+import time
+from collections.abc import Callable
 from pathlib import Path
+from unittest.mock import patch
 
+import orjson
+import pytest
+from pyfakefs.fake_filesystem import FakeFilesystem
+
+from trivial_todo_app import storage as storage_module
 from trivial_todo_app.storage import TodoStorage
 from trivial_todo_app.todo import Todo
 
+# pyfakefs patches Python-level os and io calls, which the mypyc-compiled storage
+# module bypasses; under that build fs tests would touch real file descriptors
+needs_pure_python_storage = pytest.mark.skipif(
+    not str(storage_module.__file__).endswith(".py"),
+    reason="pyfakefs cannot intercept file calls made by the compiled storage module",
+)
+
 
 class TestTodoStorage:
-    """Test suite for TodoStorage class."""
+    """Test suite for TodoStorage class.
 
-    def test_save_and_load_single_todo(self) -> None:
-        """Saving and loading a single todo should persist correctly."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            storage_path = Path(tmpdir) / "todos.json"
-            storage = TodoStorage(storage_path)
+    Plain round-trip tests run on pyfakefs's in-memory filesystem; tests that
+    depend on real rename, fsync or file-descriptor behaviour use a temp dir.
+    """
 
-            # Create and save a todo
-            original_todo = Todo(id=1, title="Buy groceries", done=False)
-            storage.save([original_todo])
+    @needs_pure_python_storage
+    @pytest.mark.parametrize(
+        "todos",
+        [
+            [Todo(id=1, title="Buy groceries", done=False)],
+            [
+                Todo(id=1, title="Buy groceries", done=False),
+                Todo(id=2, title="Walk the dog", done=True),
+                Todo(id=3, title="Read a book", done=False),
+            ],
+        ],
+        ids=["single", "multiple"],
+    )
+    def test_save_and_load_round_trip(self, fs: FakeFilesystem, todos: list[Todo]) -> None:
+        """Saving and loading todos should preserve every field and the order."""
+        fs.create_dir("/data")
+        storage_path = Path("/data/todos.json")
 
-            # Load and verify
-            loaded_todos = storage.load()
+        TodoStorage(storage_path).save(todos)
 
-            assert len(loaded_todos) == 1
-            assert loaded_todos[0].id == 1
-            assert loaded_todos[0].title == "Buy groceries"
-            assert loaded_todos[0].done is False
+        # Load through a fresh instance so the file is parsed, not served from cache
+        assert TodoStorage(storage_path).load() == todos
 
     def test_load_from_nonexistent_file_returns_empty_list(self) -> None:
         """Loading from non-existent file should return empty list."""
@@ -39,72 +66,299 @@ class TestTodoStorage:
 
             assert todos == []
 
-    def test_save_and_load_multiple_todos(self) -> None:
-        """Saving and loading multiple todos should preserve all data."""
+    @needs_pure_python_storage
+    def test_load_from_empty_file_returns_empty_list(self, fs: FakeFilesystem) -> None:
+        """Loading from empty file should return empty list."""
+        fs.create_dir("/data")
+        storage_path = Path("/data/todos.json")
+        storage = TodoStorage(storage_path)
+
+        # Create empty file
+        storage_path.write_text("")
+
+        todos = storage.load()
+
+        assert todos == []
+
+    @needs_pure_python_storage
+    def test_load_from_invalid_json_returns_empty_list(self, fs: FakeFilesystem) -> None:
+        """Loading from file with invalid JSON should return empty list."""
+        fs.create_dir("/data")
+        storage_path = Path("/data/todos.json")
+        storage = TodoStorage(storage_path)
+
+        # Create file with invalid JSON
+        storage_path.write_text("not valid json")
+
+        todos = storage.load()
+
+        assert todos == []
+
+    def test_save_uses_atomic_write(self) -> None:
+        """Save should use atomic write (temp file + rename)."""
         with tempfile.TemporaryDirectory() as tmpdir:
             storage_path = Path(tmpdir) / "todos.json"
             storage = TodoStorage(storage_path)
 
-            # Create and save multiple todos
-            original_todos = [
-                Todo(id=1, title="Buy groceries", done=False),
-                Todo(id=2, title="Walk the dog", done=True),
-                Todo(id=3, title="Read a book", done=False),
-            ]
-            storage.save(original_todos)
-
-            # Load and verify
-            loaded_todos = storage.load()
-
-            assert len(loaded_todos) == 3
-            assert loaded_todos[0].id == 1
-            assert loaded_todos[0].title == "Buy groceries"
-            assert loaded_todos[0].done is False
-            assert loaded_todos[1].id == 2
-            assert loaded_todos[1].title == "Walk the dog"
-            assert loaded_todos[1].done is True
-            assert loaded_todos[2].id == 3
-            assert loaded_todos[2].title == "Read a book"
-            assert loaded_todos[2].done is False
-
-    def test_load_from_empty_file_returns_empty_list(self) -> None:
-        """Loading from empty file should return empty list."""
+            # Save todos
+            todos = [Todo(id=1, title="Test", done=False)]
+            storage.save(todos)
+
+            # Verify file exists and contains correct data
+            assert storage_path.exists()
+            data = orjson.loads(storage_path.read_bytes())
+            assert len(data) == 1
+            assert data[0]["id"] == 1
+
+    def test_load_reuses_cached_todos_while_file_unchanged(self) -> None:
+        """Repeated loads should not re-parse the file when mtime and size are unchanged."""
         with tempfile.TemporaryDirectory() as tmpdir:
             storage_path = Path(tmpdir) / "todos.json"
             storage = TodoStorage(storage_path)
+            storage.save([Todo(id=1, title="Test", done=False)])
 
-            # Create empty file
-            storage_path.write_text("")
+            with patch("trivial_todo_app.storage.orjson.loads") as mock_loads:
+                todos = storage.load()
 
-            todos = storage.load()
+            mock_loads.assert_not_called()
+            assert todos == [Todo(id=1, title="Test", done=False)]
 
-            assert todos == []
+    def test_modifying_returned_todos_does_not_change_later_loads(self) -> None:
+        """Todos handed to or returned by storage should not alias its cache."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = TodoStorage(Path(tmpdir) / "todos.json")
+            saved = [Todo(id=1, title="First", done=False)]
+            storage.save(saved)
 
-    def test_load_from_invalid_json_returns_empty_list(self) -> None:
-        """Loading from file with invalid JSON should return empty list."""
+            saved[0].done = True
+            storage.load()[0].done = True
+            got = storage.get(1)
+            assert got is not None
+            got.title = "Changed"
+            next(storage.iter_todos()).done = True
+
+            assert storage.load() == [Todo(id=1, title="First", done=False)]
+            assert storage.get(1) == Todo(id=1, title="First", done=False)
+
+    def test_load_rereads_file_changed_by_another_writer(self) -> None:
+        """Load should pick up changes made through a different storage instance."""
         with tempfile.TemporaryDirectory() as tmpdir:
             storage_path = Path(tmpdir) / "todos.json"
             storage = TodoStorage(storage_path)
+            storage.save([Todo(id=1, title="Test", done=False)])
+            storage.load()
 
-            # Create file with invalid JSON
-            storage_path.write_text("not valid json")
+            TodoStorage(storage_path).save(
+                [Todo(id=1, title="Test", done=False), Todo(id=2, title="Other", done=True)]
+            )
 
             todos = storage.load()
 
-            assert todos == []
+            assert [t.id for t in todos] == [1, 2]
 
-    def test_save_uses_atomic_write(self) -> None:
-        """Save should use atomic write (temp file + rename)."""
+    def test_load_rereads_file_replaced_with_same_size_and_mtime(self) -> None:
+        """Load should notice a file renamed over ours even if its mtime and size match."""
         with tempfile.TemporaryDirectory() as tmpdir:
             storage_path = Path(tmpdir) / "todos.json"
             storage = TodoStorage(storage_path)
+            storage.save([Todo(id=1, title="aaaa", done=False)])
+            before = storage_path.stat()
 
-            # Save todos
-            todos = [Todo(id=1, title="Test", done=False)]
+            TodoStorage(storage_path).save([Todo(id=1, title="bbbb", done=False)])
+            os.utime(storage_path, ns=(before.st_atime_ns, before.st_mtime_ns))
+
+            assert storage.load() == [Todo(id=1, title="bbbb", done=False)]
+
+    def test_iter_todos_yields_saved_todos_in_order(self) -> None:
+        """Iterating should yield the same todos as load, one at a time."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage_path = Path(tmpdir) / "todos.json"
+            storage = TodoStorage(storage_path)
+            todos = [Todo(id=1, title="First", done=False), Todo(id=2, title="Second", done=True)]
             storage.save(todos)
 
-            # Verify file exists and contains correct data
-            assert storage_path.exists()
-            data = json.loads(storage_path.read_text())
-            assert len(data) == 1
-            assert data[0]["id"] == 1
+            assert [*TodoStorage(storage_path).iter_todos()] == todos
+            assert [*TodoStorage(Path(tmpdir) / "missing.json").iter_todos()] == []
+
+    def test_failed_save_leaves_existing_file_and_no_temp_files(self) -> None:
+        """A failed write should keep the previous file and clean up its temp file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage_path = Path(tmpdir) / "todos.json"
+            storage = TodoStorage(storage_path)
+            storage.save([Todo(id=1, title="Keep me", done=False)])
+
+            with (
+                patch("trivial_todo_app.storage.os.fsync", side_effect=OSError("Disk full")),
+                pytest.raises(OSError, match="Disk full"),
+            ):
+                storage.save([Todo(id=1, title="Lost", done=True)])
+
+            assert [p.name for p in Path(tmpdir).iterdir()] == ["todos.json"]
+            assert storage.load() == [Todo(id=1, title="Keep me", done=False)]
+
+    def test_non_atomic_save_rewrites_file_in_place(self) -> None:
+        """With atomic=False, save should rewrite the same file without a temp file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage_path = Path(tmpdir) / "todos.json"
+            storage = TodoStorage(storage_path, atomic=False)
+            storage.save([Todo(id=1, title="First", done=False)])
+            inode = storage_path.stat().st_ino
+
+            with patch("trivial_todo_app.storage.tempfile.mkstemp") as mock_mkstemp:
+                storage.save([Todo(id=1, title="First", done=True)])
+
+            mock_mkstemp.assert_not_called()
+            assert storage_path.stat().st_ino == inode
+            assert TodoStorage(storage_path).load() == [Todo(id=1, title="First", done=True)]
+
+    def test_get_looks_up_todos_by_id(self) -> None:
+        """Get should return the todo with the given id, or None if missing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage_path = Path(tmpdir) / "todos.json"
+            storage = TodoStorage(storage_path)
+            assert storage.get(1) is None
+
+            storage.save([Todo(id=1, title="First", done=False), Todo(id=5, title="Fifth")])
+
+            assert storage.get(5) == Todo(id=5, title="Fifth", done=False)
+            assert storage.get(2) is None
+
+    def test_save_writes_compact_json_records(self) -> None:
+        """Save should write compact JSON records with no whitespace."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage_path = Path(tmpdir) / "todos.json"
+            storage = TodoStorage(storage_path)
+
+            storage.save(
+                [Todo(id=1, title='Say "hi"', done=False), Todo(id=2, title="Ünï", done=True)]
+            )
+
+            expected = (
+                '[{"id":1,"title":"Say \\"hi\\"","done":false},{"id":2,"title":"Ünï","done":true}]'
+            )
+            assert storage_path.read_bytes() == expected.encode()
+
+    def test_load_skips_parsing_empty_array_file(self) -> None:
+        """Loading a file containing only '[]' should not invoke the JSON decoder."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage_path = Path(tmpdir) / "todos.json"
+            storage_path.write_text("[]")
+            storage = TodoStorage(storage_path)
+
+            with patch("trivial_todo_app.storage.orjson.loads") as mock_loads:
+                assert storage.load() == []
+                assert [*storage.iter_todos()] == []
+
+            mock_loads.assert_not_called()
+
+    def test_save_async_writes_in_background_and_flush_waits(self) -> None:
+        """Async saves should land on disk in order once flush returns."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage_path = Path(tmpdir) / "todos.json"
+            storage = TodoStorage(storage_path)
+
+            storage.save_async([Todo(id=1, title="First", done=False)])
+            storage.save_async([Todo(id=1, title="First", done=True)])
+            storage.flush()
+
+            assert TodoStorage(storage_path).load() == [Todo(id=1, title="First", done=True)]
+
+    def test_save_async_saves_todos_as_they_were_when_submitted(self) -> None:
+        """Changing todos after save_async should affect neither the file nor the cache."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage_path = Path(tmpdir) / "todos.json"
+            storage = TodoStorage(storage_path)
+            todos = [Todo(id=1, title="First", done=False)]
+
+            storage.save_async(todos)
+            todos[0].done = True
+            storage.flush()
+
+            assert storage.load() == [Todo(id=1, title="First", done=False)]
+            assert TodoStorage(storage_path).load() == [Todo(id=1, title="First", done=False)]
+
+    def test_save_waits_for_queued_async_saves(self) -> None:
+        """A save after save_async should be the one left on disk, however slow the async one."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage_path = Path(tmpdir) / "todos.json"
+            storage = TodoStorage(storage_path)
+
+            with patch("os.fsync", side_effect=_slow_on_writer_thread(os.fsync)):
+                storage.save_async([Todo(id=1, title="Async", done=False)])
+                storage.save([Todo(id=1, title="Sync", done=False)])
+            storage.flush()
+
+            assert TodoStorage(storage_path).load() == [Todo(id=1, title="Sync", done=False)]
+
+    def test_load_sees_queued_async_saves(self) -> None:
+        """Load and iter_todos should wait for a queued async save instead of reading past it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = TodoStorage(Path(tmpdir) / "todos.json")
+
+            with patch("os.fsync", side_effect=_slow_on_writer_thread(os.fsync)):
+                storage.save_async([Todo(id=1, title="First", done=False)])
+                loaded = storage.load()
+                storage.save_async([Todo(id=2, title="Second", done=False)])
+                iterated = [*storage.iter_todos()]
+            storage.flush()
+
+            assert loaded == [Todo(id=1, title="First", done=False)]
+            assert iterated == [Todo(id=2, title="Second", done=False)]
+
+    def test_import_leaves_async_machinery_unloaded(self) -> None:
+        """Importing storage should not import concurrent.futures or register an exit hook."""
+        code = (
+            "import atexit, sys\n"
+            "before = atexit._ncallbacks()\n"
+            "import trivial_todo_app.storage\n"
+            "print('concurrent.futures' in sys.modules, atexit._ncallbacks() - before)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout == "False 0\n"
+
+    def test_flush_releases_storage_and_writer(self) -> None:
+        """After flush, nothing outside the caller should hold on to the storage."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = TodoStorage(Path(tmpdir) / "todos.json")
+            unused = TodoStorage(Path(tmpdir) / "other.json")
+
+            storage.save_async([Todo(id=1, title="Test", done=False)])
+            storage.flush()
+
+            assert storage._writer is None
+            assert sys.getrefcount(storage) == sys.getrefcount(unused)
+
+    def test_exit_hook_reports_unflushed_save_error(self) -> None:
+        """A failed async save nobody flushed should be raised at interpreter exit."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = TodoStorage(Path(tmpdir) / "missing-dir" / "todos.json")
+            storage.save_async([Todo(id=1, title="Test", done=False)]).exception()
+
+            with pytest.raises(FileNotFoundError):
+                storage_module._flush_all()
+            storage_module._flush_all()
+
+    def test_flush_reraises_background_save_error(self) -> None:
+        """A failed async save should surface from flush."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = TodoStorage(Path(tmpdir) / "missing-dir" / "todos.json")
+
+            storage.save_async([Todo(id=1, title="Test", done=False)])
+
+            with pytest.raises(FileNotFoundError):
+                storage.flush()
+            storage.flush()
+
+
+def _slow_on_writer_thread(fsync: Callable[[int], None]) -> Callable[[int], None]:
+    """Wrap fsync so calls from the async writer thread take a while."""
+
+    def slow_fsync(fd: int) -> None:
+        if threading.current_thread().name.startswith("todo-writer"):
+            time.sleep(0.1)
+        fsync(fd)
+
+    return slow_fsync
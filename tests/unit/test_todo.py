@@ -1,9 +1,39 @@
 """Unit tests for Todo domain model and TodoManager."""
 
+import shutil
+
 import pytest
 
 from trivial_todo_app.storage import TodoStorage
-from trivial_todo_app.todo import Todo
+from trivial_todo_app.todo import Todo, TodoManager
+
+
+@pytest.fixture(scope="class")
+def shared_storage(tmp_path_factory):
+    """One storage file shared by every test in a class."""
+    return TodoStorage(tmp_path_factory.mktemp("todos", numbered=True) / "todos.json")
+
+
+@pytest.fixture(scope="session")
+def seeded_todos_json(tmp_path_factory):
+    """A todos.json holding three todos, written once per session; never modify it."""
+    path = tmp_path_factory.mktemp("seed") / "todos.json"
+    TodoStorage(path).save(
+        [
+            Todo(id=1, title="First", done=False),
+            Todo(id=2, title="Second", done=True),
+            Todo(id=3, title="Third", done=False),
+        ]
+    )
+    return path
+
+
+@pytest.fixture
+def seeded_storage(tmp_path, seeded_todos_json):
+    """Storage over a private copy of the seeded todos file."""
+    path = tmp_path / "todos.json"
+    shutil.copyfile(seeded_todos_json, path)
+    return TodoStorage(path)
 
 
 class TestTodoDataclass:
@@ -23,24 +53,35 @@ class TestTodoDataclass:
 
         assert todo.done is False
 
+    def test_todo_json_round_trip(self):
+        """Todo converts to and from its JSON record."""
+        todo = Todo(id=1, title="Buy groceries", done=True)
+
+        assert todo.to_json() == {"id": 1, "title": "Buy groceries", "done": True}
+        assert Todo.from_json(todo.to_json()) == todo
+
+    def test_todo_uses_slots(self):
+        """Todo instances have no per-instance __dict__."""
+        assert not hasattr(Todo(id=1, title="Test task"), "__dict__")
+
 
 class TestTodoManager:
     """Tests for TodoManager business logic."""
 
-    def test_init_accepts_storage(self, tmp_path):
-        """TodoManager initializes with a TodoStorage instance."""
-        from trivial_todo_app.todo import TodoManager
+    @pytest.fixture(autouse=True)
+    def storage(self, shared_storage):
+        """Hand each test the shared storage, emptying it again afterwards."""
+        yield shared_storage
+        shared_storage.save([])
 
-        storage = TodoStorage(tmp_path / "todos.json")
+    def test_init_accepts_storage(self, storage):
+        """TodoManager initializes with a TodoStorage instance."""
         manager = TodoManager(storage)
 
         assert manager.storage is storage
 
-    def test_add_creates_todo_with_id_1_for_empty_list(self, tmp_path):
+    def test_add_creates_todo_with_id_1_for_empty_list(self, storage):
         """Add creates todo with ID 1 when list is empty."""
-        from trivial_todo_app.todo import TodoManager
-
-        storage = TodoStorage(tmp_path / "todos.json")
         manager = TodoManager(storage)
 
         todo = manager.add("Buy groceries")
@@ -49,29 +90,16 @@ class TestTodoManager:
         assert todo.title == "Buy groceries"
         assert todo.done is False
 
-    def test_add_creates_todo_with_next_sequential_id(self, tmp_path):
+    def test_add_creates_todo_with_next_sequential_id(self, seeded_storage):
         """Add creates todo with next sequential ID after existing todos."""
-        from trivial_todo_app.todo import TodoManager
+        manager = TodoManager(seeded_storage)
+        todo = manager.add("Fourth task")
 
-        storage = TodoStorage(tmp_path / "todos.json")
-        # Pre-populate with existing todos
-        existing_todos = [
-            Todo(id=1, title="First", done=False),
-            Todo(id=2, title="Second", done=True),
-        ]
-        storage.save(existing_todos)
+        assert todo.id == 4
+        assert todo.title == "Fourth task"
 
-        manager = TodoManager(storage)
-        todo = manager.add("Third task")
-
-        assert todo.id == 3
-        assert todo.title == "Third task"
-
-    def test_add_saves_todo_to_storage(self, tmp_path):
+    def test_add_saves_todo_to_storage(self, storage):
         """Add persists the new todo to storage."""
-        from trivial_todo_app.todo import TodoManager
-
-        storage = TodoStorage(tmp_path / "todos.json")
         manager = TodoManager(storage)
 
         manager.add("Test task")
@@ -81,51 +109,35 @@ class TestTodoManager:
         assert len(saved_todos) == 1
         assert saved_todos[0].title == "Test task"
 
-    def test_add_rejects_empty_title(self, tmp_path):
+    def test_add_rejects_empty_title(self, storage):
         """Add raises ValueError for empty title."""
-        from trivial_todo_app.todo import TodoManager
-
-        storage = TodoStorage(tmp_path / "todos.json")
         manager = TodoManager(storage)
 
-        with pytest.raises(ValueError, match="Title cannot be empty"):
+        with pytest.raises(ValueError) as exc_info:
             manager.add("")
 
-    def test_add_rejects_whitespace_only_title(self, tmp_path):
-        """Add raises ValueError for whitespace-only title."""
-        from trivial_todo_app.todo import TodoManager
+        assert str(exc_info.value) == "Title cannot be empty"
 
-        storage = TodoStorage(tmp_path / "todos.json")
+    def test_add_rejects_whitespace_only_title(self, storage):
+        """Add raises ValueError for whitespace-only title."""
         manager = TodoManager(storage)
 
-        with pytest.raises(ValueError, match="Title cannot be empty"):
+        with pytest.raises(ValueError) as exc_info:
             manager.add("   ")
 
-    def test_list_all_returns_empty_list_when_no_todos(self, tmp_path):
-        """List all returns empty list when storage is empty."""
-        from trivial_todo_app.todo import TodoManager
+        assert str(exc_info.value) == "Title cannot be empty"
 
-        storage = TodoStorage(tmp_path / "todos.json")
+    def test_list_all_returns_empty_list_when_no_todos(self, storage):
+        """List all returns empty list when storage is empty."""
         manager = TodoManager(storage)
 
         todos = manager.list_all()
 
         assert todos == []
 
-    def test_list_all_returns_all_todos(self, tmp_path):
+    def test_list_all_returns_all_todos(self, seeded_storage):
         """List all returns all todos from storage."""
-        from trivial_todo_app.todo import TodoManager
-
-        storage = TodoStorage(tmp_path / "todos.json")
-        # Pre-populate with todos
-        existing_todos = [
-            Todo(id=1, title="First", done=False),
-            Todo(id=2, title="Second", done=True),
-            Todo(id=3, title="Third", done=False),
-        ]
-        storage.save(existing_todos)
-
-        manager = TodoManager(storage)
+        manager = TodoManager(seeded_storage)
         todos = manager.list_all()
 
         assert len(todos) == 3
@@ -133,62 +145,41 @@ class TestTodoManager:
         assert todos[1].id == 2
         assert todos[2].id == 3
 
-    def test_mark_done_sets_done_flag(self, tmp_path):
+    def test_mark_done_sets_done_flag(self, seeded_storage):
         """Mark done sets the done flag to True."""
-        from trivial_todo_app.todo import TodoManager
-
-        storage = TodoStorage(tmp_path / "todos.json")
-        existing_todos = [
-            Todo(id=1, title="First", done=False),
-            Todo(id=2, title="Second", done=False),
-        ]
-        storage.save(existing_todos)
+        manager = TodoManager(seeded_storage)
+        todo = manager.mark_done(1)
 
-        manager = TodoManager(storage)
-        manager.mark_done(1)
-
-        # Verify it was marked done
-        todos = storage.load()
+        # Verify the updated todo was returned and marked done
+        assert todo == Todo(id=1, title="First", done=True)
+        todos = seeded_storage.load()
         assert todos[0].done is True
-        assert todos[1].done is False
+        assert todos[1].done is True
+        assert todos[2].done is False
 
-    def test_mark_done_persists_to_storage(self, tmp_path):
+    def test_mark_done_persists_to_storage(self, seeded_storage):
         """Mark done persists the change to storage."""
-        from trivial_todo_app.todo import TodoManager
-
-        storage = TodoStorage(tmp_path / "todos.json")
-        existing_todos = [Todo(id=1, title="Test", done=False)]
-        storage.save(existing_todos)
-
-        manager = TodoManager(storage)
+        manager = TodoManager(seeded_storage)
         manager.mark_done(1)
 
         # Load fresh from storage
-        todos = storage.load()
+        todos = TodoStorage(seeded_storage.storage_path).load()
         assert todos[0].done is True
 
-    def test_mark_done_validates_todo_exists(self, tmp_path):
+    def test_mark_done_validates_todo_exists(self, seeded_storage):
         """Mark done raises ValueError when todo doesn't exist."""
-        from trivial_todo_app.todo import TodoManager
+        manager = TodoManager(seeded_storage)
 
-        storage = TodoStorage(tmp_path / "todos.json")
-        existing_todos = [Todo(id=1, title="Test", done=False)]
-        storage.save(existing_todos)
-
-        manager = TodoManager(storage)
-
-        with pytest.raises(ValueError, match="Todo #999 not found"):
+        with pytest.raises(ValueError) as exc_info:
             manager.mark_done(999)
 
-    def test_mark_done_validates_not_already_done(self, tmp_path):
-        """Mark done raises ValueError when todo is already done."""
-        from trivial_todo_app.todo import TodoManager
+        assert str(exc_info.value) == "Todo #999 not found"
 
-        storage = TodoStorage(tmp_path / "todos.json")
-        existing_todos = [Todo(id=1, title="Test", done=True)]
-        storage.save(existing_todos)
+    def test_mark_done_validates_not_already_done(self, seeded_storage):
+        """Mark done raises ValueError when todo is already done."""
+        manager = TodoManager(seeded_storage)
 
-        manager = TodoManager(storage)
+        with pytest.raises(ValueError) as exc_info:
+            manager.mark_done(2)
 
-        with pytest.raises(ValueError, match="Todo #1 is already done"):
-            manager.mark_done(1)
+        assert str(exc_info.value) == "Todo #2 is already done"